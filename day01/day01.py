@@ -1,3 +1,9 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
 def get_puzzle_input():
     puzzle_input = []
     with open("input.txt") as input_txt:
@@ -39,11 +45,106 @@ def solve_part_2(puzzle_input):
     return zero_count
 
 
+def parse_rotations(data):
+    # "R68" -> 68 and "L30" -> -30, parsed in C by numpy instead of one
+    # int() call per line. Any whitespace (including blank lines) separates.
+    if isinstance(data, str):
+        data = data.encode()
+    signed = data.replace(b"R", b"").replace(b"L", b"-")
+    return np.fromstring(signed, dtype=np.int64, sep="\n")
+
+
+def get_rotation_array(filename="input.txt"):
+    with open(filename, "rb") as input_txt:
+        return parse_rotations(input_txt.read())
+
+
+def solve_fast(rotations, start=50):
+    # Both answers from one cumulative sum: (zero landings, zero passes).
+    after = start + np.cumsum(rotations)
+    before = after - rotations
+
+    # The dial lands on zero whenever the unwrapped position is a multiple of 100.
+    landings = int(np.count_nonzero(after % 100 == 0))
+
+    # Right turns hit every multiple of 100 in (before, after],
+    # left turns every multiple of 100 in [after, before).
+    right = after // 100 - before // 100
+    left = (before - 1) // 100 - (after - 1) // 100
+    passes = int(np.where(rotations > 0, right, left).sum())
+    return landings, passes
+
+
+def chunk_boundaries(filename, chunks):
+    # Split the file into byte ranges that always end on a newline.
+    size = os.path.getsize(filename)
+    bounds = [0]
+    with open(filename, "rb") as input_txt:
+        for i in range(1, chunks):
+            offset = max(size * i // chunks, bounds[-1])
+            input_txt.seek(offset)
+            input_txt.readline()
+            bounds.append(min(input_txt.tell(), size))
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if a < b]
+
+
+def summarize_rotations(rotations):
+    # Reduce a run of rotations to (net displacement, landings[p], passes[p]),
+    # where the tables give the zero counts when the run starts at position p.
+    after = np.cumsum(rotations)
+    before = after - rotations
+
+    landings = np.bincount(-after % 100, minlength=100)
+
+    # floor((p + x) / 100) == x // 100 + (x % 100 >= 100 - p), so the pass
+    # count for every start is a constant plus histogram suffix sums.
+    right = rotations > 0
+    plus = np.concatenate((after[right], before[~right] - 1))
+    minus = np.concatenate((before[right], after[~right] - 1))
+    base = int((plus // 100).sum() - (minus // 100).sum())
+    hist = np.bincount(plus % 100, minlength=100)
+    hist -= np.bincount(minus % 100, minlength=100)
+    suffix = np.zeros(101, dtype=np.int64)
+    suffix[:100] = np.cumsum(hist[::-1])[::-1]
+    passes = base + suffix[100 - np.arange(100)]
+
+    net = int(after[-1]) if len(after) else 0
+    return net, landings.tolist(), passes.tolist()
+
+
+def summarize_chunk(filename, start, end):
+    with open(filename, "rb") as input_txt:
+        input_txt.seek(start)
+        return summarize_rotations(parse_rotations(input_txt.read(end - start)))
+
+
+def combine_summaries(summaries, start=50):
+    position = start
+    landings = passes = 0
+    for net, chunk_landings, chunk_passes in summaries:
+        landings += chunk_landings[position]
+        passes += chunk_passes[position]
+        position = (position + net) % 100
+    return landings, passes
+
+
+def solve_chunked(filename="input.txt", workers=None):
+    workers = workers or os.cpu_count() or 1
+    ranges = chunk_boundaries(filename, workers * 4)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        summaries = pool.map(
+            summarize_chunk,
+            [filename] * len(ranges),
+            [a for a, _ in ranges],
+            [b for _, b in ranges],
+        )
+        return combine_summaries(summaries)
+
+
 if __name__ == "__main__":
-    puzzle_input = get_puzzle_input()
+    rotations = get_rotation_array()
 
-    answer_1 = solve_part_1(puzzle_input)
+    answer_1, answer_2 = solve_fast(rotations)
     print(f"Part 1: {answer_1}")
-
-    answer_2 = solve_part_2(puzzle_input)
     print(f"Part 2: {answer_2}")
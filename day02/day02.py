@@ -1,36 +1,190 @@
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+def divisors(n):
+    return [d for d in range(1, n) if n % d == 0]
+
+
+def repunit(n, d):
+    # 1, 101, 10101, ... : multiplying a d-digit block by this repeats it to n digits.
+    return (10**n - 1) // (10**d - 1)
+
+
+def digit_lengths(start, end):
+    return range(len(str(max(start, 1))), len(str(end)) + 1)
+
+
+def block_range(start, end, n, d):
+    # d-digit blocks whose n-digit repetition falls inside [start, end].
+    multiplier = repunit(n, d)
+    lo = max(10 ** (d - 1), -(-start // multiplier))
+    hi = min(10**d - 1, end // multiplier)
+    return multiplier, lo, hi
+
+
+def repeated_sum(start, end, n, d):
+    multiplier, lo, hi = block_range(start, end, n, d)
+    if lo > hi:
+        return 0
+    return multiplier * (lo + hi) * (hi - lo + 1) // 2
+
+
+def primitive_sums(start, end, n):
+    # Sum of n-digit IDs in range whose smallest period is exactly d. A number
+    # repeating with period e also repeats with every multiple of e, so strip
+    # the smaller periods out (inclusion-exclusion over the divisors).
+    primitive = {}
+    for d in divisors(n):
+        primitive[d] = repeated_sum(start, end, n, d) - sum(
+            total for e, total in primitive.items() if d % e == 0
+        )
+    return primitive
+
+
+def sum_doubled(start, end):
+    return sum(
+        repeated_sum(start, end, n, n // 2)
+        for n in digit_lengths(start, end)
+        if n % 2 == 0
+    )
+
+
+def sum_repeated(start, end):
+    return sum(
+        sum(primitive_sums(start, end, n).values()) for n in digit_lengths(start, end)
+    )
+
+
+def repeated_ids(start, end, doubled_only=False):
+    # Yield the invalid IDs in [start, end] in ascending order without
+    # visiting any of the valid ones.
+    for n in digit_lengths(start, end):
+        periods = [n // 2] if doubled_only and n % 2 == 0 else []
+        if not doubled_only:
+            periods = divisors(n)
+        ids = set()
+        for d in periods:
+            multiplier, lo, hi = block_range(start, end, n, d)
+            ids.update(block * multiplier for block in range(lo, hi + 1))
+        yield from sorted(ids)
+
+
 def solve_part_1(puzzle_input):
-    sum = 0
-    for nums in puzzle_input:
-        start = nums[0]
-        end = nums[1]
-        for i in range(start, end + 1):
-            s = str(i)
-            n = len(s)
-            if n % 2 == 0:
-                if s[: n // 2] == s[n // 2 :]:
-                    sum += i
-    return sum
+    return sum(sum_doubled(start, end) for start, end in puzzle_input)
+
 
 def solve_part_2(puzzle_input):
-    sum = 0
-    for nums in puzzle_input:
-        start = nums[0]
-        end = nums[1]
-        for i in range(start, end + 1):
-            s = str(i)
-            n = len(s)
-            # Check if the string can be decomposed into a repeating pattern
-            is_invalid = False
-            for pattern_len in range(1, n // 2 + 1):
-                if n % pattern_len == 0:
-                    pattern = s[:pattern_len]
-                    repetitions = n // pattern_len
-                    if repetitions >= 2 and s == pattern * repetitions:
-                        is_invalid = True
-                        break
-            if is_invalid:
-                sum += i
-    return sum
+    return sum(sum_repeated(start, end) for start, end in puzzle_input)
+
+
+# Table file layout, little-endian throughout: header, then the doubled IDs,
+# their prefix sums, the repeated IDs and their prefix sums as uint64.
+TABLE_MAGIC = b"AOC2"
+TABLE_HEADER = struct.Struct("<4sIQQ")
+
+
+class InvalidIdTable:
+    def __init__(self, max_digits, doubled, doubled_prefix, repeated, repeated_prefix):
+        self.max_digits = max_digits
+        self.doubled = doubled
+        self.doubled_prefix = doubled_prefix
+        self.repeated = repeated
+        self.repeated_prefix = repeated_prefix
+        self._mmap = None
+
+    @classmethod
+    def build(cls, max_digits=12):
+        limit = 10**max_digits - 1
+        doubled = array("Q", repeated_ids(1, limit, doubled_only=True))
+        repeated = array("Q", repeated_ids(1, limit))
+        return cls(
+            max_digits,
+            doubled,
+            cls._prefix_sums(doubled),
+            repeated,
+            cls._prefix_sums(repeated),
+        )
+
+    @staticmethod
+    def _prefix_sums(values):
+        prefix = array("Q", [0])
+        total = 0
+        for value in values:
+            total += value
+            if total >= 1 << 64:
+                raise ValueError("Prefix sums overflow 64 bits, use fewer digits.")
+            prefix.append(total)
+        return prefix
+
+    def save(self, filename):
+        with open(filename, "wb") as f:
+            f.write(
+                TABLE_HEADER.pack(
+                    TABLE_MAGIC, self.max_digits, len(self.doubled), len(self.repeated)
+                )
+            )
+            for values in (
+                self.doubled,
+                self.doubled_prefix,
+                self.repeated,
+                self.repeated_prefix,
+            ):
+                values = array("Q", values)
+                if sys.byteorder == "big":
+                    values.byteswap()
+                f.write(values.tobytes())
+
+    @classmethod
+    def load(cls, filename):
+        # On little-endian hosts the arrays are memoryviews over the mapped
+        # file, so nothing is copied; big-endian hosts get byteswapped copies.
+        with open(filename, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, max_digits, n_doubled, n_repeated = TABLE_HEADER.unpack_from(mapped)
+        if magic != TABLE_MAGIC:
+            raise ValueError(f"Not an invalid-ID table: {filename}")
+
+        view = memoryview(mapped)[TABLE_HEADER.size :].cast("Q")
+        sections = []
+        offset = 0
+        for length in (n_doubled, n_doubled + 1, n_repeated, n_repeated + 1):
+            section = view[offset : offset + length]
+            if sys.byteorder == "big":
+                section = array("Q", section)
+                section.byteswap()
+            sections.append(section)
+            offset += length
+
+        table = cls(max_digits, *sections)
+        table._mmap = mapped
+        return table
+
+    @staticmethod
+    def _range_sum(values, prefix, start, end):
+        return prefix[bisect_right(values, end)] - prefix[bisect_left(values, start)]
+
+    def _check(self, end):
+        if end >= 10**self.max_digits:
+            raise ValueError(f"{end} exceeds the {self.max_digits}-digit table.")
+
+    def sum_doubled(self, start, end):
+        self._check(end)
+        return self._range_sum(self.doubled, self.doubled_prefix, start, end)
+
+    def sum_repeated(self, start, end):
+        self._check(end)
+        return self._range_sum(self.repeated, self.repeated_prefix, start, end)
+
+
+def solve_with_table(puzzle_input, table):
+    answer_1 = sum(table.sum_doubled(start, end) for start, end in puzzle_input)
+    answer_2 = sum(table.sum_repeated(start, end) for start, end in puzzle_input)
+    return answer_1, answer_2
+
 
 def get_puzzle_input():
     puzzle_input = []
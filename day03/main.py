@@ -1,54 +1,114 @@
+import mmap
+import os
+
+import numpy as np
+
+
+def max_joltage(bank, k):
+    # Largest k-digit subsequence: keep a non-increasing stack of digits and
+    # pop smaller ones while enough digits remain to still pick k in total.
+    drops = len(bank) - k
+    if drops < 0:
+        raise ValueError(f"Bank of {len(bank)} batteries cannot supply {k}.")
+    stack = []
+    for digit in bank:
+        while drops and stack and stack[-1] < digit:
+            stack.pop()
+            drops -= 1
+        stack.append(digit)
+    return int("".join(stack[:k]))
+
+
 def solve_part_1(puzzle_input):
-    total_joltage = 0
-    
-    for bank in puzzle_input:
-        max_joltage = 0
-        # Find all pairs of indices (i, j) where i < j
-        for i in range(len(bank)):
-            for j in range(i + 1, len(bank)):
-                # Form the two-digit number from digits at positions i and j
-                joltage = int(bank[i] + bank[j])
-                max_joltage = max(max_joltage, joltage)
-        total_joltage += max_joltage
-    
-    return total_joltage
+    return sum(max_joltage(bank, 2) for bank in puzzle_input)
+
 
 def solve_part_2(puzzle_input):
-    total_joltage = 0
-    
-    for bank in puzzle_input:
-        n = len(bank)
-        k = 12  # Need to select exactly 12 batteries
-        
-        # Use greedy approach: for each of the 12 positions,
-        # select the maximum digit available while ensuring we can
-        # still select enough digits to complete the 12
-        selected_indices = []
-        start_idx = 0
-        
-        for pos in range(k):
-            # For position 'pos', we can choose from indices [start_idx, n - (k - pos)]
-            # This ensures we have enough digits left to complete the selection
-            end_idx = n - (k - pos) + 1
-            max_digit = -1
-            max_idx = -1
-            
-            # Find the maximum digit in the available range
-            for i in range(start_idx, end_idx):
-                digit = int(bank[i])
-                if digit > max_digit:
-                    max_digit = digit
-                    max_idx = i
-            
-            selected_indices.append(max_idx)
-            start_idx = max_idx + 1
-        
-        # Form the number from selected digits
-        joltage_str = ''.join(bank[i] for i in selected_indices)
-        joltage = int(joltage_str)
-        total_joltage += joltage
-    
-    return total_joltage
+    return sum(max_joltage(bank, 12) for bank in puzzle_input)
+
+
+def max_joltage_batch(banks, k, chunk_bytes=1 << 22):
+    # banks is a 2-D uint8 array of ASCII digits, one equal-length bank per
+    # row. Same greedy as above, but each pick is one argmax over all rows,
+    # taken over column chunks so the masked copy stays within chunk_bytes.
+    rows, n = banks.shape
+    if n < k:
+        raise ValueError(f"Bank of {n} batteries cannot supply {k}.")
+    if k > 18:
+        raise ValueError("Joltages above 18 digits do not fit in int64.")
+    if rows and (banks.min() < ord("0") or banks.max() > ord("9")):
+        raise ValueError("Banks may only contain the digits 0-9.")
+    width = max(1, chunk_bytes // max(rows, 1))
+    row_idx = np.arange(rows)
+    start = np.zeros(rows, dtype=np.intp)
+    joltage = np.zeros(rows, dtype=np.int64)
+    for pos in range(k):
+        end = n - k + pos + 1
+        # Leftmost largest digit in banks[r, start[r]:end]; masked columns
+        # read as 0, below every digit, and only strictly larger digits
+        # from later chunks replace an earlier pick.
+        best = np.zeros(rows, dtype=np.uint8)
+        picked = np.zeros(rows, dtype=np.intp)
+        for lo in range(int(start.min()), end, width):
+            hi = min(lo + width, end)
+            window = np.where(np.arange(lo, hi) >= start[:, None], banks[:, lo:hi], 0)
+            col = window.argmax(axis=1)
+            digit = window[row_idx, col]
+            better = digit > best
+            best[better] = digit[better]
+            picked[better] = col[better] + lo
+        joltage = joltage * 10 + (best - ord("0"))
+        start = picked + 1
+    return joltage
+
+
+def iter_bank_batches(filename="input.txt", batch_bytes=1 << 24):
+    # Yield 2-D uint8 views of equal-length banks straight from the mapped
+    # file, about batch_bytes at a time; no per-line or per-digit Python
+    # objects are created.
+    if not os.path.getsize(filename):
+        return
+    with open(filename, "rb") as input_txt:
+        mapped = mmap.mmap(input_txt.fileno(), 0, access=mmap.ACCESS_READ)
+    data = np.frombuffer(mapped, dtype=np.uint8)
+
+    ends = np.flatnonzero(data == ord("\n"))
+    if not len(ends) or ends[-1] != len(data) - 1:
+        ends = np.append(ends, len(data))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    # Leave the "\r" of CRLF line endings out of the bank.
+    ends = ends - ((ends > starts) & (data[np.maximum(ends - 1, 0)] == ord("\r")))
+    lengths = ends - starts
+
+    n = int(lengths[0])
+    stride = int(starts[1] - starts[0]) if len(starts) > 1 else n + 1
+    if np.all(lengths == n) and np.all(np.diff(starts) == stride):
+        # Every line has the same length: the file already is the 2-D batch.
+        grid = np.lib.stride_tricks.as_strided(
+            data, shape=(len(starts), n), strides=(stride, 1), writeable=False
+        )
+        batch_rows = max(1, batch_bytes // max(n, 1))
+        for r in range(0, len(starts), batch_rows):
+            yield grid[r : r + batch_rows]
+        return
+
+    for n in np.unique(lengths).tolist():
+        if not n:
+            continue
+        # Every length-n window of the file; indexing it by line start copies
+        # just the selected banks.
+        lines = np.lib.stride_tricks.sliding_window_view(data, n)
+        group = starts[lengths == n]
+        batch_rows = max(1, batch_bytes // n)
+        for r in range(0, len(group), batch_rows):
+            yield lines[group[r : r + batch_rows]]
+
+
+def solve_batched(k, filename="input.txt"):
+    return sum(
+        int(max_joltage_batch(banks, k).sum()) for banks in iter_bank_batches(filename)
+    )
+
 
 def get_puzzle_input():
     puzzle_input = []
@@ -1,3 +1,14 @@
+import mmap
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # the pure-Python solvers below still work without it
+    np = None
+
+
 def solve_part_1(puzzle_input):
     grid = [list(line) for line in puzzle_input]
     rows = len(grid)
@@ -26,46 +37,274 @@ def solve_part_1(puzzle_input):
     return accessible_count
 
 
+def removal_rounds(puzzle_input):
+    # k-core style peeling: keep each roll's neighbour count up to date and
+    # only revisit rolls whose count changed, instead of rescanning the grid.
+    # Returns the number of rolls removed in each round.
+    rows = len(puzzle_input)
+    cols = len(puzzle_input[0]) if rows > 0 else 0
+
+    # Flat grid with a one-cell border so neighbours never go out of bounds.
+    width = cols + 2
+    alive = bytearray(width * (rows + 2))
+    for i, line in enumerate(puzzle_input):
+        base = (i + 1) * width + 1
+        for j, cell in enumerate(line):
+            if cell == "@":
+                alive[base + j] = 1
+
+    offsets = [-width - 1, -width, -width + 1, -1, 1, width - 1, width, width + 1]
+    counts = [0] * len(alive)
+    frontier = []
+    for pos, roll in enumerate(alive):
+        if roll:
+            counts[pos] = sum(alive[pos + d] for d in offsets)
+            if counts[pos] < 4:
+                frontier.append(pos)
+
+    rounds = []
+    while frontier:
+        # Rolls in a round are removed together, as in the original rescans.
+        for pos in frontier:
+            alive[pos] = 0
+        rounds.append(len(frontier))
+
+        next_frontier = []
+        for pos in frontier:
+            for d in offsets:
+                nb = pos + d
+                if alive[nb]:
+                    counts[nb] -= 1
+                    # Queue each roll exactly once, when it first drops below 4.
+                    if counts[nb] == 3:
+                        next_frontier.append(nb)
+        frontier = next_frontier
+
+    return rounds
+
+
 def solve_part_2(puzzle_input):
-    grid = [list(line) for line in puzzle_input]
-    rows = len(grid)
-    cols = len(grid[0]) if rows > 0 else 0
+    return sum(removal_rounds(puzzle_input))
 
-    # Directions for 8 neighbors: up, down, left, right, and 4 diagonals
-    directions = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
 
-    total_removed = 0
+# Maps every byte to b"0" except "@", which maps to b"1".
+ROLL_BITS = bytes(ord("1") if b == ord("@") else ord("0") for b in range(256))
+
+
+def grid_to_bitboard(puzzle_input):
+    # One Python int per row, with bit j set when column j holds a roll.
+    return [
+        int(line.encode().translate(ROLL_BITS)[::-1] or b"0", 2)
+        for line in puzzle_input
+    ]
+
+
+def crowded_rows(board, cols):
+    # For every row, a bitmask of the cells with at least 4 neighbouring rolls.
+    # The 8 neighbour planes are fed through a bit-sliced counter (s0, s1) that
+    # saturates into s2 once it reaches 4, so each row costs a few dozen ops.
+    full = (1 << cols) - 1
+    crowded = []
+    for i, row in enumerate(board):
+        above = board[i - 1] if i > 0 else 0
+        below = board[i + 1] if i + 1 < len(board) else 0
+        s0 = s1 = s2 = 0
+        for plane in (
+            (above << 1) & full,
+            above,
+            above >> 1,
+            (row << 1) & full,
+            row >> 1,
+            (below << 1) & full,
+            below,
+            below >> 1,
+        ):
+            carry = s0 & plane
+            s0 ^= plane
+            s2 |= s1 & carry
+            s1 ^= carry
+        crowded.append(s2)
+    return crowded
+
+
+def accessible_rows(board, cols):
+    return [row & ~crowded for row, crowded in zip(board, crowded_rows(board, cols))]
+
+
+def solve_part_1_bitboard(board, cols):
+    return sum(row.bit_count() for row in accessible_rows(board, cols))
+
+
+def removal_rounds_bitboard(board, cols):
+    board = list(board)
+    rounds = []
+    while True:
+        removable = accessible_rows(board, cols)
+        removed = sum(row.bit_count() for row in removable)
+        if not removed:
+            return rounds
+        board = [row & ~gone for row, gone in zip(board, removable)]
+        rounds.append(removed)
+
+
+def solve_part_2_bitboard(board, cols):
+    return sum(removal_rounds_bitboard(board, cols))
+
 
+def grid_shape(filename):
+    # Rows are assumed to be equal length and newline terminated.
+    with open(filename, "rb") as input_txt:
+        cols = len(input_txt.readline().rstrip(b"\n"))
+    return -(-os.path.getsize(filename) // (cols + 1)), cols
+
+
+def read_bitboard_rows(filename, lo, hi, cols):
+    # Read rows [lo, hi) through mmap; rows outside the grid read as empty.
+    rows, _ = grid_shape(filename)
+    with open(filename, "rb") as input_txt:
+        mapped = mmap.mmap(input_txt.fileno(), 0, access=mmap.ACCESS_READ)
+    with mapped:
+        board = []
+        for i in range(lo, hi):
+            if 0 <= i < rows:
+                line = mapped[i * (cols + 1) : i * (cols + 1) + cols]
+                board.append(int(line.translate(ROLL_BITS)[::-1] or b"0", 2))
+            else:
+                board.append(0)
+    return board
+
+
+def stripe_bounds(rows, stripes):
+    return [
+        (rows * k // stripes, rows * (k + 1) // stripes)
+        for k in range(stripes)
+        if rows * k // stripes < rows * (k + 1) // stripes
+    ]
+
+
+def count_accessible_stripe(filename, lo, hi, cols):
+    # The stripe plus one halo row on each side is enough to classify it.
+    board = read_bitboard_rows(filename, lo - 1, hi + 1, cols)
+    return sum(row.bit_count() for row in accessible_rows(board, cols)[1:-1])
+
+
+def solve_part_1_tiled(filename="input.txt", workers=None):
+    workers = workers or os.cpu_count() or 1
+    rows, cols = grid_shape(filename)
+    bounds = stripe_bounds(rows, workers * 4)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(
+            pool.map(
+                count_accessible_stripe,
+                [filename] * len(bounds),
+                [lo for lo, _ in bounds],
+                [hi for _, hi in bounds],
+                [cols] * len(bounds),
+            )
+        )
+
+
+def peel_stripe(conn, filename, lo, hi, cols):
+    # Owns rows [lo, hi) for the whole run. Each round it receives the
+    # neighbouring stripes' boundary rows, removes its accessible rolls and
+    # replies with the count and its own new boundary rows.
+    board = read_bitboard_rows(filename, lo, hi, cols)
+    conn.send((0, board[0], board[-1]))
     while True:
-        # Find all accessible rolls in this iteration
-        accessible_positions = []
-
-        for i in range(rows):
-            for j in range(cols):
-                if grid[i][j] == "@":
-                    # Count adjacent rolls
-                    adjacent_rolls = 0
-                    for di, dj in directions:
-                        ni, nj = i + di, j + dj
-                        if 0 <= ni < rows and 0 <= nj < cols:
-                            if grid[ni][nj] == "@":
-                                adjacent_rolls += 1
-
-                    # If fewer than 4 adjacent rolls, forklift can access it
-                    if adjacent_rolls < 4:
-                        accessible_positions.append((i, j))
-
-        # If no accessible rolls, we're done
-        if not accessible_positions:
+        halos = conn.recv()
+        if halos is None:
             break
+        above, below = halos
+        removable = accessible_rows([above] + board + [below], cols)[1:-1]
+        board = [row & ~gone for row, gone in zip(board, removable)]
+        conn.send((sum(row.bit_count() for row in removable), board[0], board[-1]))
+    conn.close()
+
+
+def removal_rounds_tiled(filename="input.txt", workers=None):
+    workers = workers or os.cpu_count() or 1
+    rows, cols = grid_shape(filename)
+    bounds = stripe_bounds(rows, workers)
+
+    conns, procs = [], []
+    for lo, hi in bounds:
+        parent_conn, child_conn = multiprocessing.Pipe()
+        proc = multiprocessing.Process(
+            target=peel_stripe, args=(child_conn, filename, lo, hi, cols)
+        )
+        proc.start()
+        conns.append(parent_conn)
+        procs.append(proc)
+
+    rounds = []
+    try:
+        edges = [conn.recv()[1:] for conn in conns]
+        while True:
+            for k, conn in enumerate(conns):
+                above = edges[k - 1][1] if k > 0 else 0
+                below = edges[k + 1][0] if k + 1 < len(edges) else 0
+                conn.send((above, below))
+            replies = [conn.recv() for conn in conns]
+            removed = sum(reply[0] for reply in replies)
+            if not removed:
+                break
+            rounds.append(removed)
+            edges = [reply[1:] for reply in replies]
+    finally:
+        for conn in conns:
+            conn.send(None)
+        for proc in procs:
+            proc.join()
+
+    return rounds
 
-        # Remove all accessible rolls
-        for i, j in accessible_positions:
-            grid[i][j] = "."
 
-        total_removed += len(accessible_positions)
+def solve_part_2_tiled(filename="input.txt", workers=None):
+    return sum(removal_rounds_tiled(filename, workers))
 
-    return total_removed
+
+def grid_to_array(puzzle_input):
+    rows = len(puzzle_input)
+    cols = len(puzzle_input[0]) if rows > 0 else 0
+    data = np.frombuffer("".join(puzzle_input).encode(), dtype=np.uint8)
+    return data.reshape(rows, cols) == ord("@")
+
+
+def neighbour_counts(rolls):
+    # Sum of the 8 shifted copies of a zero-padded grid (a 3x3 box filter
+    # minus the centre), computed with whole-array adds.
+    padded = np.pad(rolls.astype(np.uint8), 1)
+    rows, cols = rolls.shape
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for di in range(3):
+        for dj in range(3):
+            if di != 1 or dj != 1:
+                counts += padded[di : di + rows, dj : dj + cols]
+    return counts
+
+
+def accessible_mask(rolls):
+    return rolls & (neighbour_counts(rolls) < 4)
+
+
+def solve_part_1_numpy(rolls):
+    return int(accessible_mask(rolls).sum())
+
+
+def removal_rounds_numpy(rolls):
+    rolls = rolls.copy()
+    rounds = []
+    while True:
+        removable = accessible_mask(rolls)
+        removed = int(removable.sum())
+        if not removed:
+            return rounds
+        rolls &= ~removable
+        rounds.append(removed)
+
+
+def solve_part_2_numpy(rolls):
+    return sum(removal_rounds_numpy(rolls))
 
 
 def get_puzzle_input():
@@ -79,8 +318,15 @@ def get_puzzle_input():
 if __name__ == "__main__":
     puzzle_input = get_puzzle_input()
 
-    answer_1 = solve_part_1(puzzle_input)
-    print(f"Part 1: {answer_1}")
+    if np is not None:
+        rolls = grid_to_array(puzzle_input)
+        answer_1 = solve_part_1_numpy(rolls)
+        answer_2 = solve_part_2_numpy(rolls)
+    else:
+        board = grid_to_bitboard(puzzle_input)
+        cols = len(puzzle_input[0]) if puzzle_input else 0
+        answer_1 = solve_part_1_bitboard(board, cols)
+        answer_2 = solve_part_2_bitboard(board, cols)
 
-    answer_2 = solve_part_2(puzzle_input)
+    print(f"Part 1: {answer_1}")
     print(f"Part 2: {answer_2}")
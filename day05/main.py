@@ -1,79 +1,145 @@
-def solve_part_1(puzzle_input):
-    # Find the blank line that separates ranges from IDs
-    blank_line_idx = -1
-    for i, line in enumerate(puzzle_input):
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+def parse_inventory(puzzle_input):
+    # Ranges come first, then a blank line, then the ingredient IDs.
+    ranges, ingredient_ids = [], []
+    lines = iter(puzzle_input)
+    for line in lines:
         if not line.strip():  # Found blank line
-            blank_line_idx = i
             break
-
-    # Parse ranges
-    ranges = []
-    for line in puzzle_input[:blank_line_idx]:
-        if line.strip() and "-" in line:
+        if "-" in line:
             start, end = map(int, line.split("-"))
             ranges.append((start, end))
-
-    # Parse ingredient IDs
-    ingredient_ids = []
-    start_idx = blank_line_idx + 1 if blank_line_idx >= 0 else blank_line_idx
-    for line in puzzle_input[start_idx:]:
+    for line in lines:
         if line.strip():  # Skip empty lines
             ingredient_ids.append(int(line.strip()))
+    return ranges, ingredient_ids
 
-    # Count how many ingredient IDs are fresh (fall into any range)
-    fresh_count = 0
-    for ingredient_id in ingredient_ids:
-        is_fresh = False
-        for start, end in ranges:
-            if start <= ingredient_id <= end:
-                is_fresh = True
-                break
-        if is_fresh:
-            fresh_count += 1
-
-    return fresh_count
-
-
-def solve_part_2(puzzle_input):
-    # Find the blank line that separates ranges from IDs
-    blank_line_idx = -1
-    for i, line in enumerate(puzzle_input):
-        if not line.strip():  # Found blank line
-            blank_line_idx = i
-            break
 
-    # Parse ranges
-    ranges = []
-    for line in puzzle_input[:blank_line_idx]:
-        if line.strip() and "-" in line:
-            start, end = map(int, line.split("-"))
-            ranges.append((start, end))
-
-    # Optimize: Merge overlapping ranges and count total coverage
-    # Sort ranges by start value
-    ranges.sort(key=lambda x: x[0])
-
-    # Merge overlapping/adjacent ranges
+def merge_ranges(ranges):
+    # Sort by start and merge overlapping/adjacent ranges
     merged = []
-    for start, end in ranges:
-        if not merged:
-            merged.append((start, end))
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
         else:
-            last_start, last_end = merged[-1]
-            # If current range overlaps or is adjacent to the last merged range
-            if start <= last_end + 1:
-                # Merge: extend the last range if needed
-                merged[-1] = (last_start, max(last_end, end))
-            else:
-                # No overlap, add as new range
-                merged.append((start, end))
+            merged.append([start, end])
+    return merged
+
+
+class IntervalIndex:
+    def __init__(self, ranges):
+        merged = merge_ranges(ranges)
+        # Parallel, sorted and disjoint inclusive bounds.
+        self.starts = [start for start, _ in merged]
+        self.ends = [end for _, end in merged]
+
+    def contains(self, ingredient_id):
+        i = bisect_right(self.starts, ingredient_id) - 1
+        return i >= 0 and ingredient_id <= self.ends[i]
+
+    def count_fresh(self, ingredient_ids):
+        # Walk the sorted IDs and the merged intervals together.
+        fresh_count = 0
+        i, n = 0, len(self.starts)
+        for ingredient_id in sorted(ingredient_ids):
+            while i < n and self.ends[i] < ingredient_id:
+                i += 1
+            if i == n:
+                break
+            if self.starts[i] <= ingredient_id:
+                fresh_count += 1
+        return fresh_count
+
+    def total_covered(self):
+        # Count total unique IDs covered by merged ranges (inclusive)
+        return sum(end - start + 1 for start, end in zip(self.starts, self.ends))
+
+
+# Store file layout: a little-endian header (magic, interval count, covered
+# total) followed by all starts, then all ends, as little-endian int64.
+STORE_MAGIC = b"AOC5"
+STORE_HEADER = struct.Struct("<4s4xQQ")
+
+
+class IntervalStore(IntervalIndex):
+    # An IntervalIndex that can grow one range at a time and be persisted.
+    def __init__(self, ranges=()):
+        super().__init__(ranges)
+        self.starts = array("q", self.starts)
+        self.ends = array("q", self.ends)
+        self.covered = super().total_covered()
+        self._mmap = None
+
+    def total_covered(self):
+        return self.covered
+
+    def add_range(self, start, end):
+        # Intervals [i, j) overlap or touch the new range; splice them out and
+        # put the single merged interval in their place.
+        self._make_writable()
+        i = bisect_left(self.ends, start - 1)
+        j = bisect_right(self.starts, end + 1)
+        if i < j:
+            start = min(start, self.starts[i])
+            end = max(end, self.ends[j - 1])
+            for k in range(i, j):
+                self.covered -= self.ends[k] - self.starts[k] + 1
+        self.starts[i:j] = array("q", [start])
+        self.ends[i:j] = array("q", [end])
+        self.covered += end - start + 1
+
+    def _make_writable(self):
+        # Loaded stores are read-only views of the file until the first update.
+        if self._mmap is not None:
+            self.starts = array("q", self.starts)
+            self.ends = array("q", self.ends)
+            self._mmap = None
+
+    def save(self, filename):
+        with open(filename, "wb") as f:
+            f.write(STORE_HEADER.pack(STORE_MAGIC, len(self.starts), self.covered))
+            for bounds in (self.starts, self.ends):
+                bounds = array("q", bounds)
+                if sys.byteorder == "big":
+                    bounds.byteswap()
+                f.write(bounds.tobytes())
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, covered = STORE_HEADER.unpack_from(mapped)
+        if magic != STORE_MAGIC:
+            raise ValueError(f"Not an interval store: {filename}")
+
+        view = memoryview(mapped)[STORE_HEADER.size :].cast("q")
+        store = cls.__new__(cls)
+        store.starts = view[:count]
+        store.ends = view[count : 2 * count]
+        store.covered = covered
+        store._mmap = mapped
+        if sys.byteorder == "big":
+            # The file is little-endian, so the zero-copy views are unusable.
+            store._make_writable()
+            store.starts.byteswap()
+            store.ends.byteswap()
+        return store
 
-    # Count total unique IDs covered by merged ranges
-    total_fresh = 0
-    for start, end in merged:
-        total_fresh += end - start + 1  # Inclusive range
 
-    return total_fresh
+def solve_part_1(puzzle_input):
+    ranges, ingredient_ids = parse_inventory(puzzle_input)
+    return IntervalIndex(ranges).count_fresh(ingredient_ids)
+
+
+def solve_part_2(puzzle_input):
+    ranges, _ = parse_inventory(puzzle_input)
+    return IntervalIndex(ranges).total_covered()
 
 
 def get_puzzle_input():
@@ -88,10 +154,11 @@ def get_puzzle_input():
 
 
 if __name__ == "__main__":
-    puzzle_input = get_puzzle_input()
+    ranges, ingredient_ids = parse_inventory(get_puzzle_input())
+    index = IntervalIndex(ranges)
 
-    answer_1 = solve_part_1(puzzle_input)
+    answer_1 = index.count_fresh(ingredient_ids)
     print(f"Part 1: {answer_1}")
 
-    answer_2 = solve_part_2(puzzle_input)
+    answer_2 = index.total_covered()
     print(f"Part 2: {answer_2}")
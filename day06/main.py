@@ -1,75 +1,161 @@
-def find_separators(lines):
-    max_width = max(len(line) for line in lines)
-    seps = [
-        col
-        for col in range(max_width)
-        if all(col >= len(line) or line[col] == " " for line in lines)
-    ]
-    return seps, max_width
-
-
-def slices_from_separators(seps, max_width):
-    slices, start = [], 0
-    for sep in seps:
-        if start < sep:
-            slices.append((start, sep))
-        start = sep + 1
-    if start < max_width:
-        slices.append((start, max_width))
-    return slices
+import numpy as np
+
+
+SPACE = ord(" ")
+
+# Numbers with more digits than this may not fit in int64.
+INT64_DIGITS = 18
+
+
+class Worksheet:
+    # The sheet as a byte matrix plus the column bounds and operator of every
+    # problem, found with whole-array tests. Numbers are only read when a part
+    # asks for them, as flat arrays: the values of all problems back to back,
+    # the problem each value belongs to, and exact Python ints for problems
+    # holding a number too long for int64.
+    def __init__(self, lines):
+        width = max((len(line) for line in lines), default=0)
+        self.lines = [line.ljust(width) for line in lines]
+        self.grid = np.frombuffer("".join(self.lines).encode(), dtype=np.uint8)
+        self.grid = self.grid.reshape(len(lines), width)
+
+        # Problems are the runs of columns that are not blank in every line.
+        used = (self.grid != SPACE).any(axis=0)
+        edges = np.diff(used.astype(np.int8), prepend=0, append=0)
+        self.starts = np.flatnonzero(edges == 1)
+        self.ends = np.flatnonzero(edges == -1)
+
+        ops_row = self.grid[-1] if len(lines) else np.empty(0, dtype=np.uint8)
+        marks = np.flatnonzero(ops_row != SPACE)
+        self.is_sum = np.zeros(len(self.starts), dtype=bool)
+        self.is_sum[self.problem_of(marks[ops_row[marks] == ord("+")])] = True
+
+    def problem_of(self, cols):
+        return np.searchsorted(self.starts, cols, side="right") - 1
+
+    def row_numbers(self):
+        # One number per non-blank segment of each line above the operators.
+        values, owners, lengths = [], [], []
+        for line, row in zip(self.lines[:-1], self.grid[:-1]):
+            digit = row != SPACE
+            first = np.flatnonzero(digit & ~np.concatenate(([False], digit[:-1])))
+            last = np.flatnonzero(digit & ~np.concatenate((digit[1:], [False])))
+            if not len(first):
+                continue  # np.fromstring reads a blank line as [0]
+            values.append(np.fromstring(line, dtype=np.int64, sep=" "))
+            owners.append(self.problem_of(first))
+            lengths.append(last + 1 - first)
+        if not values:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.intp), {}
+
+        owner = np.concatenate(owners)
+        order = np.argsort(owner, kind="stable")
+        long = np.concatenate(lengths) > INT64_DIGITS
+        exact = {
+            p: [
+                int(seg)
+                for line in self.lines[:-1]
+                if (seg := line[self.starts[p] : self.ends[p]].strip())
+            ]
+            for p in set(owner[long].tolist())
+        }
+        return np.concatenate(values)[order], owner[order], exact
+
+    def column_numbers(self):
+        # One number per column, its digits read top to bottom.
+        value = np.zeros(self.grid.shape[1], dtype=np.int64)
+        count = np.zeros(self.grid.shape[1], dtype=np.int64)
+        for row in self.grid[:-1]:
+            digit = row != SPACE
+            value = np.where(digit, value * 10 + (row - ord("0")), value)
+            count += digit
+
+        cols = np.flatnonzero(count)
+        owner = self.problem_of(cols)
+        exact = {}
+        for p in set(owner[count[cols] > INT64_DIGITS].tolist()):
+            exact[p] = []
+            for col in range(self.starts[p], self.ends[p]):
+                digits = "".join(line[col] for line in self.lines[:-1]).replace(" ", "")
+                if digits:
+                    exact[p].append(int(digits))
+        return value[cols], owner, exact
+
+
+def product_tree(numbers):
+    # Multiply in balanced pairs so big-integer operands stay similar in size.
+    numbers = list(numbers)
+    if not numbers:
+        return 1
+    while len(numbers) > 1:
+        paired = [a * b for a, b in zip(numbers[::2], numbers[1::2])]
+        if len(numbers) % 2:
+            paired.append(numbers[-1])
+        numbers = paired
+    return numbers[0]
 
 
 def apply(numbers, op):
     if op == "+":
         return sum(numbers)
-    result = 1
-    for n in numbers:
-        result *= n
-    return result
-
-
-def solve_part_1(puzzle_input):
-    seps, max_width = find_separators(puzzle_input)
-    slices = slices_from_separators(seps, max_width)
-
-    total = 0
-    for start, end in slices:
-        col_data = [
-            seg for line in puzzle_input if (seg := line[start:end].strip())
-        ]
-        if len(col_data) < 2:
-            continue
-        op, nums = col_data[-1].strip(), []
-        for val in col_data[:-1]:
-            nums.append(int(val))
-
-        total += apply(nums, op)
+    return product_tree(numbers)
+
+
+# A result below 2**INT64_BITS fits in int64.
+INT64_BITS = 63
+
+
+def evaluate_problems(values, offsets, is_sum):
+    # Problem p is values[offsets[p] : offsets[p + 1]] (never empty), summed
+    # when is_sum[p] and multiplied otherwise. All problems are reduced at
+    # once in int64; only those whose result might overflow are redone with
+    # exact Python integers via apply(). Returns the results as a list.
+    if len(offsets) < 2:
+        return []
+    starts = offsets[:-1]
+
+    # frexp's exponent is never below the bit length, so a sum fits when the
+    # count's and the largest value's add up to at most 63, and a product
+    # when its factors' do (or when one of them is zero).
+    bits = np.frexp(values.astype(np.float64))[1]
+    count_bits = np.frexp(np.diff(offsets).astype(np.float64))[1]
+    sum_fits = np.maximum.reduceat(bits, starts) + count_bits <= INT64_BITS
+    product_fits = (np.add.reduceat(bits, starts) <= INT64_BITS) | (
+        np.minimum.reduceat(values, starts) == 0
+    )
+    fits = np.where(is_sum, sum_fits, product_fits)
+
+    results = np.where(
+        is_sum,
+        np.add.reduceat(values, starts),
+        np.multiply.reduceat(values, starts),
+    ).tolist()
+    for p in np.flatnonzero(~fits).tolist():
+        numbers = values[offsets[p] : offsets[p + 1]].tolist()
+        results[p] = apply(numbers, "+" if is_sum[p] else "*")
+    return results
+
+
+def sheet_total(sheet, numbers):
+    # Problems without numbers are skipped, as in the original solvers.
+    values, owner, exact = numbers
+    if exact:
+        fast = ~np.isin(owner, list(exact))
+        values, owner = values[fast], owner[fast]
+    first = np.flatnonzero(np.diff(owner, prepend=-1))
+    offsets = np.append(first, len(owner))
+    total = sum(evaluate_problems(values, offsets, sheet.is_sum[owner[first]]))
+    for p, numbers in exact.items():
+        total += apply(numbers, "+" if sheet.is_sum[p] else "*")
     return total
 
 
-def solve_part_2(puzzle_input):
-    seps, max_width = find_separators(puzzle_input)
-    slices = slices_from_separators(seps, max_width)
+def solve_part_1(sheet):
+    return sheet_total(sheet, sheet.row_numbers())
 
-    total = 0
-    for start, end in slices:
-        width = end - start
-        if width <= 0:
-            continue
 
-        nums, op = [], None
-        for rel_col in range(width - 1, -1, -1):
-            abs_col = start + rel_col
-            col = [line[abs_col] if abs_col < len(line) else " " for line in puzzle_input]
-            if col[-1] in "+*":
-                op = col[-1]
-            digits = "".join(ch for ch in col[:-1] if ch != " ")
-            if digits:
-                nums.append(int(digits))
-
-        total += apply(nums, op)
-
-    return total
+def solve_part_2(sheet):
+    return sheet_total(sheet, sheet.column_numbers())
 
 
 def get_puzzle_input():
@@ -78,10 +164,10 @@ def get_puzzle_input():
 
 
 if __name__ == "__main__":
-    puzzle_input = get_puzzle_input()
+    sheet = Worksheet(get_puzzle_input())
 
-    answer_1 = solve_part_1(puzzle_input)
+    answer_1 = solve_part_1(sheet)
     print(f"Part 1: {answer_1}")
 
-    answer_2 = solve_part_2(puzzle_input)
+    answer_2 = solve_part_2(sheet)
     print(f"Part 2: {answer_2}")
@@ -1,70 +1,76 @@
-def solve_part_1(puzzle_input):
-    grid = puzzle_input
+import heapq
+from bisect import bisect_left
+
+
+def build_splitter_index(grid):
+    # column -> ascending rows holding a '^'
+    index = {}
+    for r, line in enumerate(grid):
+        c = line.find("^")
+        while c != -1:
+            index.setdefault(c, []).append(r)
+            c = line.find("^", c + 1)
+    return index
+
+
+def beam_events(grid, index=None):
+    # Beams jump straight to the next splitter in their column. Splitter hits
+    # are processed in row order with the timelines of beams arriving at the
+    # same splitter merged, so the cost scales with splitters hit rather than
+    # with rows * cols. Returns (splitters hit, timelines).
     if not grid or not grid[0]:
-        return 0
-    rows, cols = len(grid), len(grid[0])
+        return 0, 0
+    cols = len(grid[0])
+    if index is None:
+        index = build_splitter_index(grid)
 
-    # Find start
     start_row = next(r for r, line in enumerate(grid) if "S" in line)
     start_col = grid[start_row].index("S")
 
+    pending = {}  # (row, col) of a splitter -> timelines arriving there
+    events = []
+    exit_count = 0
+
+    def drop(row, col, w):
+        nonlocal exit_count
+        rows = index.get(col, ())
+        i = bisect_left(rows, row)
+        if i == len(rows):
+            exit_count += w
+            return
+        key = (rows[i], col)
+        if key not in pending:
+            pending[key] = 0
+            heapq.heappush(events, key)
+        pending[key] += w
+
+    drop(start_row + 1, start_col, 1)
+
     splits = 0
-    visited = set()
-    q = [(start_row + 1, start_col)]
+    while events:
+        r, c = heapq.heappop(events)
+        w = pending.pop((r, c))
+        splits += 1
+        for nc in (c - 1, c + 1):
+            if 0 <= nc < cols:
+                drop(r + 1, nc, w)
+            else:
+                exit_count += w
 
-    while q:
-        r, c = q.pop()
-        if r >= rows or c < 0 or c >= cols:
-            continue
-        if (r, c) in visited:
-            continue
-        visited.add((r, c))
+    return splits, exit_count
 
-        cell = grid[r][c]
-        if cell == "^":
-            splits += 1
-            q.append((r + 1, c - 1))
-            q.append((r + 1, c + 1))
-        else:  # '.' or 'S'
-            q.append((r + 1, c))
 
-    return splits
+def solve_part_1(puzzle_input):
+    return beam_events(puzzle_input)[0]
 
 
 def solve_part_2(puzzle_input):
-    grid = puzzle_input
-    if not grid or not grid[0]:
-        return 0
+    return beam_events(puzzle_input)[1]
 
-    rows, cols = len(grid), len(grid[0])
-    start_row = next(r for r, line in enumerate(grid) if "S" in line)
-    start_col = grid[start_row].index("S")
-
-    # ways[r][c] = number of timelines reaching (r, c)
-    ways = [[0] * cols for _ in range(rows + 1)]
-    exit_count = 0
-    ways[start_row + 1][start_col] = 1
-
-    for r in range(start_row + 1, rows):
-        for c in range(cols):
-            w = ways[r][c]
-            if not w:
-                continue
-            cell = grid[r][c]
-            if cell == "^":
-                for nc in (c - 1, c + 1):
-                    if 0 <= nc < cols:
-                        ways[r + 1][nc] += w
-                    else:
-                        exit_count += w
-            else:
-                nr = r + 1
-                if nr < rows:
-                    ways[nr][c] += w
-                else:
-                    exit_count += w
 
-    return exit_count
+def solve_both(puzzle_input):
+    # One event pass gives both the splitters hit and the timelines.
+    return beam_events(puzzle_input)
 
 
 def get_puzzle_input():
@@ -75,8 +81,6 @@ def get_puzzle_input():
 if __name__ == "__main__":
     puzzle_input = get_puzzle_input()
 
-    answer_1 = solve_part_1(puzzle_input)
+    answer_1, answer_2 = solve_both(puzzle_input)
     print(f"Part 1: {answer_1}")
-
-    answer_2 = solve_part_2(puzzle_input)
     print(f"Part 2: {answer_2}")
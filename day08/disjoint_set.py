@@ -0,0 +1,58 @@
+import heapq
+from array import array
+from typing import Iterable, List, Tuple
+
+
+class DisjointSet:
+    # Union-find over 0..n-1 stored in two flat int arrays, with path halving
+    # and union by size. With track_stats=True it also counts find() calls,
+    # the parent links they walked and the successful unions.
+    def __init__(self, n: int, track_stats: bool = False):
+        self.parent = array("i", range(n))
+        self.size = array("i", [1]) * n
+        self.components = n
+        self.track_stats = track_stats
+        self.finds = 0
+        self.find_depth = 0
+        self.unions = 0
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        if self.track_stats:
+            self.finds += 1
+            while parent[x] != x:
+                self.find_depth += 1
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        # Returns True when a and b were in different components.
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        size = self.size
+        if size[ra] < size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        size[ra] += size[rb]
+        self.components -= 1
+        if self.track_stats:
+            self.unions += 1
+        return True
+
+    def union_many(self, pairs: Iterable[Tuple[int, int]]) -> int:
+        # Returns how many of the pairs merged two components.
+        union = self.union
+        return sum(union(a, b) for a, b in pairs)
+
+    def component_sizes(self) -> List[int]:
+        parent, size = self.parent, self.size
+        return [size[x] for x in range(len(parent)) if parent[x] == x]
+
+    def largest_components(self, k: int) -> List[int]:
+        return heapq.nlargest(k, self.component_sizes())
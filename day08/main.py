@@ -1,112 +1,324 @@
 import heapq
-from typing import List, Tuple
+import math
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from disjoint_set import DisjointSet
 
 Point = Tuple[int, int, int]
 
 
-def k_closest_pairs(points: List[Point], k: int) -> List[Tuple[int, int, int]]:
+# Peak bytes per pair in a block, rounded up from about 25 measured with
+# tracemalloc: the int64 distance matrix, one int64 per-axis difference,
+# boolean masks and the int64 copy np.partition makes when a block alone
+# holds more than k pairs. The O(k) running set in smallest_pairs comes on
+# top of this.
+BYTES_PER_PAIR = 32
+
+
+def auto_block_size(n: int) -> int:
+    # Rows per block so that one block of pairs uses at most a quarter of the
+    # memory currently available (or 256 MiB when that cannot be queried).
+    try:
+        available = os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, OSError, ValueError):
+        available = 1 << 30
+    return max(1, min(n, available // 4 // (max(n, 1) * BYTES_PER_PAIR)))
+
+
+def iter_pair_blocks(points: List[Point], block: Optional[int] = None):
+    # Stream squared distances one block of rows at a time as (start, dist),
+    # where dist[r, c] is the pair (start + r, start + 1 + c). Entries with
+    # j <= i are set to -1, so every pair i < j appears exactly once and
+    # peak memory is bounded by block * n pairs.
+    coords = np.asarray(points, dtype=np.int64).reshape(-1, 3)
+    n = len(coords)
+    block = block or auto_block_size(n)
+    for start in range(0, n - 1, block):
+        stop = min(start + block, n - 1)
+        dist = np.zeros((stop - start, n - start - 1), dtype=np.int64)
+        for axis in range(3):
+            delta = coords[start:stop, axis, None] - coords[None, start + 1 :, axis]
+            delta *= delta
+            dist += delta
+            del delta
+        below = np.arange(n - start - 1)[None, :] < np.arange(stop - start)[:, None]
+        np.putmask(dist, below, -1)
+        del below
+        yield start, dist
+
+
+def replay_heap_selection(
+    candidates: List[Tuple[int, int, int]], k: int
+) -> List[Tuple[int, int, int]]:
+    # The original k-closest search pushed (-dist2, i, j) for every pair in
+    # (i, j) order into a size-k heap, replacing the root only on a strictly
+    # smaller distance. Which of the pairs tied at the cut-off distance
+    # survive depends on that replay, but only on pairs no farther than the
+    # k-th distance, so replaying any candidate set that contains all of them
+    # keeps exactly the same pairs. Returned sorted by (dist2, i, j).
+    heap: List[Tuple[int, int, int]] = []
+    for dist, i, j in sorted(candidates, key=lambda p: (p[1], p[2])):
+        if len(heap) < k:
+            heapq.heappush(heap, (-dist, i, j))
+        elif dist < -heap[0][0]:
+            heapq.heapreplace(heap, (-dist, i, j))
+    return sorted((-neg_dist, i, j) for neg_dist, i, j in heap)
+
+
+def smallest_pairs(points: List[Point], k: int, block: Optional[int] = None):
+    # The k smallest pairs i < j as (dist2, i, j) arrays sorted by
+    # (dist2, i, j). Each block is first cut down to at most k pairs plus
+    # ties with np.partition, and only then turned into index arrays, so the
+    # running set stays O(k). Pairs tied with the cut-off are all kept, so
+    # the result may be longer than k by those ties.
+    best = (np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.int64))
+    cutoff = None
+    for start, dist in iter_pair_blocks(points, block):
+        wanted = dist >= 0  # drop the masked j <= i entries
+        if cutoff is not None:
+            wanted &= dist <= cutoff
+        if np.count_nonzero(wanted) > k:
+            cutoff = np.partition(dist[wanted], k - 1)[k - 1]
+            wanted &= dist <= cutoff
+        r, c = np.nonzero(wanted)
+        del wanted
+
+        new = (dist[r, c], r + start, c + start + 1)
+        dist, i, j = (np.concatenate(pair) for pair in zip(best, new))
+        if len(dist) > k:
+            cutoff = dist[np.argpartition(dist, k - 1)[k - 1]]
+            keep = dist <= cutoff
+            dist, i, j = dist[keep], i[keep], j[keep]
+        best = (dist, i, j)
+
+    dist, i, j = best
+    order = np.lexsort((j, i, dist))
+    return dist[order], i[order], j[order]
+
+
+def k_closest_pairs(
+    points: List[Point], k: int, block: Optional[int] = None
+) -> List[Tuple[int, int, int]]:
+    # The k closest pairs as (dist2, i, j), ascending. smallest_pairs keeps
+    # every pair tied with the k-th distance, and the replay picks among
+    # those ties the same way the original heap search did.
+    if k <= 0:
+        return []
+    dist, i, j = (part.tolist() for part in smallest_pairs(points, k, block=block))
+    return replay_heap_selection(list(zip(dist, i, j)), k)
+
+
+def iter_sorted_edges(points: List[Point], chunk: int = 16):
+    # Yield every (dist2, i, j) edge with i < j in ascending order in a single
+    # pass. Each row i keeps a sorted chunk of its next closest partners j > i
+    # and a heap merges the rows' current heads. When a row's chunk runs out
+    # it is refilled, twice as large, from that row's distances after the
+    # last edge it yielded, so memory grows with the edges consumed rather
+    # than with all n^2 pairs.
+    coords = np.asarray(points, dtype=np.int64).reshape(-1, 3)
+    n = len(coords)
+    sizes = [chunk] * n
+
+    def next_partners(i, last_dist=-1, last_j=-1):
+        # Row i's next chunk as a list of (dist2, j) in descending order, so
+        # the closest partner can be popped off the end.
+        dist = ((coords[i + 1 :] - coords[i]) ** 2).sum(axis=1)
+        js = np.arange(i + 1, n)
+        later = (dist > last_dist) | ((dist == last_dist) & (js > last_j))
+        dist, js = dist[later], js[later]
+        if len(dist) > sizes[i]:
+            # Keep every partner tied with the cut-off, so a refill never has
+            # to split a run of equal distances.
+            cutoff = np.partition(dist, sizes[i] - 1)[sizes[i] - 1]
+            keep = dist <= cutoff
+            dist, js = dist[keep], js[keep]
+        sizes[i] *= 2
+        order = np.lexsort((js, dist))[::-1]
+        return list(zip(dist[order].tolist(), js[order].tolist()))
+
+    rows = [next_partners(i) for i in range(n - 1)]
+    heap = []
+    for i, row in enumerate(rows):
+        dist, j = row.pop()
+        heap.append((dist, i, j))
+    heapq.heapify(heap)
+
+    while heap:
+        dist, i, j = heap[0]
+        yield dist, i, j
+        row = rows[i]
+        if not row:
+            row = rows[i] = next_partners(i, dist, j)
+        if row:
+            next_dist, next_j = row.pop()
+            heapq.heapreplace(heap, (next_dist, i, next_j))
+        else:
+            heapq.heappop(heap)
+
+
+def k_closest_pairs_grid(
+    points: List[Point], k: int, cell: Optional[int] = None
+) -> List[Tuple[int, int, int]]:
+    # Same result as k_closest_pairs, but only pairs in neighbouring cells of
+    # a uniform grid are examined. Every pair closer than the cell size is
+    # found, so once k of them are, they contain the answer; otherwise the
+    # cells are doubled and the search repeated. Memory stays O(k + ties).
     n = len(points)
+    if n < 2 or k <= 0:
+        return []
 
-    heap: List[Tuple[int, int, int]] = []  # stores (-dist2, i, j)
+    extent = max(
+        max(p[axis] for p in points) - min(p[axis] for p in points) for axis in range(3)
+    )
+    if cell is None:
+        # Side at which a uniform cloud would hold about k pairs per cell
+        # neighbourhood.
+        cell = int((extent**3 * k / (n * n)) ** (1 / 3))
+    cell = max(cell, 1)
 
-    for i in range(n):
-        x1, y1, z1 = points[i]
-        for j in range(i + 1, n):
-            x2, y2, z2 = points[j]
-            dx = x1 - x2
-            dy = y1 - y2
-            dz = z1 - z2
-            dist = dx * dx + dy * dy + dz * dz
+    neighbours = [
+        (dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+    ]
+    while True:
+        grid: Dict[Point, List[int]] = {}
+        for idx, (x, y, z) in enumerate(points):
+            grid.setdefault((x // cell, y // cell, z // cell), []).append(idx)
 
-            if len(heap) < k:
-                heapq.heappush(heap, (-dist, i, j))
-            elif dist < -heap[0][0]:
-                heapq.heapreplace(heap, (-dist, i, j))
+        # Once a cell spans the whole cloud every pair is a neighbour pair.
+        everything = cell > extent
+        limit = float("inf") if everything else cell * cell
 
-    # Convert back to positive distances and sort ascending
-    closest = [(-neg_dist, i, j) for neg_dist, i, j in heap]
-    closest.sort(key=lambda x: x[0])
-    return closest
+        # Bounded max-heap of the k closest so far, plus the pairs tied with
+        # its largest distance that did not fit. Once it is full, `limit`
+        # shrinks to that distance so farther pairs are never kept.
+        heap: List[Tuple[int, int, int]] = []  # (-dist2, i, j)
+        ties: List[Tuple[int, int, int]] = []
+        for (cx, cy, cz), members in grid.items():
+            for dx, dy, dz in neighbours:
+                others = grid.get((cx + dx, cy + dy, cz + dz))
+                if not others:
+                    continue
+                for i in members:
+                    x1, y1, z1 = points[i]
+                    for j in others:
+                        if j <= i:
+                            continue
+                        x2, y2, z2 = points[j]
+                        dx2 = x1 - x2
+                        dy2 = y1 - y2
+                        dz2 = z1 - z2
+                        dist = dx2 * dx2 + dy2 * dy2 + dz2 * dz2
+                        if dist > limit:
+                            continue
+                        if len(heap) < k:
+                            heapq.heappush(heap, (-dist, i, j))
+                            if len(heap) == k:
+                                limit = -heap[0][0]
+                        elif dist == limit:
+                            ties.append((dist, i, j))
+                        else:
+                            neg_dist, ei, ej = heapq.heapreplace(heap, (-dist, i, j))
+                            if -heap[0][0] < limit:
+                                limit = -heap[0][0]
+                                ties = []
+                            else:
+                                ties.append((-neg_dist, ei, ej))
 
+        if len(heap) == k or everything:
+            kept = [(-neg_dist, i, j) for neg_dist, i, j in heap]
+            return replay_heap_selection(kept + ties, k)
+        cell *= 2
+
+
+def circuit_product(n: int, pairs: List[Tuple[int, int, int]]) -> int:
+    dsu = DisjointSet(n)
+    dsu.union_many((i, j) for _, i, j in pairs)
+    return math.prod(dsu.largest_components(3))
 
-def solve_part_1(puzzle_input):
-    n = len(puzzle_input)
 
+def solve_part_1(puzzle_input):
     # Take only the 1000 closest edges to match puzzle constraint.
-    pairs = k_closest_pairs(puzzle_input, 1000)
+    pairs = k_closest_pairs_grid(puzzle_input, 1000)
+    return circuit_product(len(puzzle_input), pairs)
+
+
+def heaviest_mst_edge(points: List[Point]) -> Tuple[int, int, int]:
+    # The union that finally connects everything when the edges are taken in
+    # (dist2, i, j) order, i.e. the last union Kruskal's algorithm makes.
+    # Dense Prim's algorithm finds the tree, keeping for every outside point
+    # only its best distance to the tree, so memory stays O(n).
+    n = len(points)
+    if n < 2:
+        raise ValueError("Need at least two junction boxes.")
 
-    parent = list(range(n))
-    size = [1] * n
+    coords = np.array(points, dtype=np.int64)
+    best = np.full(n, np.iinfo(np.int64).max, dtype=np.int64)
+    nearest = np.zeros(n, dtype=np.int64)
+    in_tree = np.zeros(n, dtype=bool)
 
-    def find(x: int) -> int:
-        while parent[x] != x:
-            parent[x] = parent[parent[x]]
-            x = parent[x]
-        return x
+    tree: List[Tuple[int, int, int]] = []
+    current = 0
+    for _ in range(n - 1):
+        in_tree[current] = True
+        best[current] = np.iinfo(np.int64).max
+        dist = ((coords - coords[current]) ** 2).sum(axis=1)
+        closer = (dist < best) & ~in_tree
+        best[closer] = dist[closer]
+        nearest[closer] = current
 
-    def union(a: int, b: int) -> None:
-        ra, rb = find(a), find(b)
-        if ra == rb:
-            return
-        if size[ra] < size[rb]:
-            ra, rb = rb, ra
-        parent[rb] = ra
-        size[ra] += size[rb]
+        current = int(best.argmin())
+        tree.append((int(best[current]), int(nearest[current]), current))
 
-    for _, i, j in pairs:
-        union(i, j)
+    # Every spanning tree has the same heaviest weight w, but when several
+    # edges weigh w Prim's tree may not hold the one Kruskal ends on. Edges
+    # lighter than w connect the same components as the tree edges lighter
+    # than w, so union those, then replay the weight-w edges in (i, j) order
+    # from the blocked distance kernel.
+    heaviest = max(dist for dist, _, _ in tree)
+    dsu = DisjointSet(n)
+    dsu.union_many((i, j) for dist, i, j in tree if dist < heaviest)
 
-    largest = sorted(size, reverse=True)
+    for start, dist in iter_pair_blocks(points):
+        rows, cols = np.nonzero(dist == heaviest)
+        for i, j in zip((rows + start).tolist(), (cols + start + 1).tolist()):
+            if dsu.union(i, j) and dsu.components == 1:
+                return heaviest, i, j
 
-    return largest[0] * largest[1] * largest[2]
+    raise AssertionError("Spanning tree did not connect every point.")
 
 
 def solve_part_2(puzzle_input):
+    _, i, j = heaviest_mst_edge(puzzle_input)
+    return puzzle_input[i][0] * puzzle_input[j][0]
+
+
+def solve_both(puzzle_input, k: int = 1000):
+    # One Kruskal run over the shared edge stream: the union that leaves one
+    # component gives part 2. The first k edges give part 1, once the stream
+    # has passed every edge tied with the k-th, so the ties can be replayed
+    # the way k_closest_pairs picks them.
     n = len(puzzle_input)
+    dsu = DisjointSet(n)
 
-    edges: List[Tuple[int, int, int]] = []
-    for i in range(n):
-        x1, y1, z1 = puzzle_input[i]
-        for j in range(i + 1, n):
-            x2, y2, z2 = puzzle_input[j]
-            dx = x1 - x2
-            dy = y1 - y2
-            dz = z1 - z2
-            dist = dx * dx + dy * dy + dz * dz
-            edges.append((dist, i, j))
-
-    edges.sort(key=lambda e: e[0])
-
-    parent = list(range(n))
-    size = [1] * n
-    components = n
-
-    def find(x: int) -> int:
-        while parent[x] != x:
-            parent[x] = parent[parent[x]]
-            x = parent[x]
-        return x
-
-    def union(a: int, b: int) -> bool:
-        nonlocal components
-        ra, rb = find(a), find(b)
-        if ra == rb:
-            return False
-        if size[ra] < size[rb]:
-            ra, rb = rb, ra
-        parent[rb] = ra
-        size[ra] += size[rb]
-        components -= 1
-        return True
-
-    last_i = last_j = -1
-    for _, i, j in edges:
-        if union(i, j):
-            last_i, last_j = i, j
-            if components == 1:
-                break
-
-    return puzzle_input[last_i][0] * puzzle_input[last_j][0]
+    closest: List[Tuple[int, int, int]] = []
+    answer_1 = answer_2 = None
+    for dist, i, j in iter_sorted_edges(puzzle_input):
+        if answer_1 is None:
+            if len(closest) < k or dist == closest[-1][0]:
+                closest.append((dist, i, j))
+            else:
+                answer_1 = circuit_product(n, replay_heap_selection(closest, k))
+        if dsu.union(i, j) and dsu.components == 1:
+            answer_2 = puzzle_input[i][0] * puzzle_input[j][0]
+        if answer_1 is not None and answer_2 is not None:
+            break
+
+    if answer_1 is None:
+        answer_1 = circuit_product(n, replay_heap_selection(closest, k))
+    return answer_1, answer_2
 
 
 def get_puzzle_input():
@@ -125,8 +337,6 @@ def get_puzzle_input():
 if __name__ == "__main__":
     puzzle_input = get_puzzle_input()
 
-    answer_1 = solve_part_1(puzzle_input)
+    answer_1, answer_2 = solve_both(puzzle_input)
     print(f"Part 1: {answer_1}")
-
-    answer_2 = solve_part_2(puzzle_input)
     print(f"Part 2: {answer_2}")
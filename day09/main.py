@@ -1,27 +1,67 @@
-from typing import List, Tuple
+import os
+from bisect import bisect_left, insort
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 Point = Tuple[int, int]
 
 
-def solve_part_1(puzzle_input: List[Point]):
-    max_area = 0
-    n = len(puzzle_input)
+def staircase(points: List[Point], x_dir: int, y_dir: int) -> List[Point]:
+    # Pareto front of the points extreme in the given directions, e.g.
+    # (-1, -1) keeps every point with no other point both left of and below it.
+    ordered = sorted(points, key=lambda p: (x_dir * -p[0], y_dir * -p[1]))
+    front: List[Point] = []
+    for x, y in ordered:
+        if not front or y_dir * y > y_dir * front[-1][1]:
+            front.append((x, y))
+    return front
 
-    for i in range(n):
-        x1, y1 = puzzle_input[i]
-        for j in range(i + 1, n):
-            x2, y2 = puzzle_input[j]
+
+def max_area_between(corners_a: List[Point], corners_b: List[Point]) -> int:
+    max_area = 0
+    for x1, y1 in corners_a:
+        for x2, y2 in corners_b:
             # Include both corner tiles, so add 1 to each dimension
             area = (abs(x1 - x2) + 1) * (abs(y1 - y2) + 1)
             if area > max_area:
                 max_area = area
-
     return max_area
 
 
-def solve_part_2(puzzle_input):
-    # Build polygon edges (points are ordered and wrap).
-    points = puzzle_input
+def solve_part_1(puzzle_input: List[Point]):
+    # The best rectangle spans either lower-left to upper-right or
+    # upper-left to lower-right; replacing a corner by a point that dominates
+    # it in that direction never shrinks the area, so only the four
+    # staircases need to be paired.
+    if len(puzzle_input) < 2:
+        return 0
+    return max(
+        max_area_between(staircase(puzzle_input, -1, -1), staircase(puzzle_input, 1, 1)),
+        max_area_between(staircase(puzzle_input, -1, 1), staircase(puzzle_input, 1, -1)),
+    )
+
+
+def merge_intervals(intervals: List[Tuple[int, int]]):
+    if not intervals:
+        return []
+    intervals.sort()
+    merged = [intervals[0]]
+    for l, r in intervals[1:]:
+        ml, mr = merged[-1]
+        if l <= mr + 1:
+            merged[-1] = (ml, max(mr, r))
+        else:
+            merged.append((l, r))
+    return merged
+
+
+def polygon_rows(points: List[Point]):
+    # Inside intervals for every vertex row, plus one sample per band of rows
+    # strictly between consecutive vertex rows (all rows in a band agree).
+    # Returns (ys, {y: intervals}, [(band_start, band_end, intervals)]).
     n = len(points)
 
     vertical_edges = []  # (x, y1, y2) with y1 < y2
@@ -40,55 +80,98 @@ def solve_part_2(puzzle_input):
             a, b = (x1, x2) if x1 < x2 else (x2, x1)
             horizontal_by_y.setdefault(y, []).append((a, b))
 
+    # Sweep the vertex rows in order, keeping the xs of the vertical edges
+    # that cross the current row (y1 <= y < y2) in a sorted list. Rows in
+    # the band below the next vertex row see the same crossings.
+    starts_at: Dict[int, List[int]] = {}
+    ends_at: Dict[int, List[int]] = {}
+    for x, y1, y2 in vertical_edges:
+        starts_at.setdefault(y1, []).append(x)
+        ends_at.setdefault(y2, []).append(x)
+
     ys = sorted({y for _, y in points})
+    active: List[int] = []
+    vertex_row_intervals = {}
+    bands = []
+    for k, y in enumerate(ys):
+        for x in ends_at.get(y, ()):
+            del active[bisect_left(active, x)]
+        for x in starts_at.get(y, ()):
+            insort(active, x)
 
-    def merge_intervals(intervals: List[Tuple[int, int]]):
-        if not intervals:
-            return []
-        intervals.sort()
-        merged = [intervals[0]]
-        for l, r in intervals[1:]:
-            ml, mr = merged[-1]
-            if l <= mr + 1:
-                merged[-1] = (ml, max(mr, r))
-            else:
-                merged.append((l, r))
-        return merged
+        crossings = list(zip(active[::2], active[1::2]))
+        horizontal = horizontal_by_y.get(y, [])
+        vertex_row_intervals[y] = merge_intervals(crossings + horizontal)
+        if k + 1 < len(ys) and ys[k + 1] - y > 1:
+            bands.append((y + 1, ys[k + 1] - 1, merge_intervals(crossings)))
 
-    def intervals_cover(intervals: List[Tuple[int, int]], l: int, r: int):
-        for a, b in intervals:
-            if a <= l and b >= r:
-                return True
-        return False
+    return ys, vertex_row_intervals, bands
 
-    def compute_intervals_for_row(y: int, include_horizontal: bool):
-        crossings = []
-        for x, y1, y2 in vertical_edges:
-            if y >= y1 and y < y2:
-                crossings.append(x)
-        crossings.sort()
 
-        intervals: List[Tuple[int, int]] = []
-        for i in range(0, len(crossings), 2):
-            if i + 1 < len(crossings):
-                intervals.append((crossings[i], crossings[i + 1]))
+def compress_axis(values: List[int]):
+    # Split the axis into each vertex coordinate on its own plus the non-empty
+    # gaps between them. Returns {coordinate: segment index}, segment count.
+    index = {}
+    segments = 0
+    for k, v in enumerate(values):
+        index[v] = segments
+        segments += 1
+        if k + 1 < len(values) and values[k + 1] - v > 1:
+            segments += 1
+    return index, segments
 
-        if include_horizontal and y in horizontal_by_y:
-            intervals.extend(horizontal_by_y[y])
 
-        return merge_intervals(intervals)
+class InsideOracle:
+    # Coordinate-compressed raster of the polygon: every compressed cell is
+    # entirely inside or entirely outside, so a 2-D prefix sum over the
+    # outside cells answers "is this rectangle inside?" in O(1).
+    def __init__(self, points: List[Point]):
+        ys, vertex_row_intervals, bands = polygon_rows(points)
+        xs = sorted({x for x, _ in points})
+        self.col_of, cols = compress_axis(xs)
+        self.row_of, _ = compress_axis(ys)
 
-    vertex_row_intervals = {y: compute_intervals_for_row(y, True) for y in ys}
+        # Compressed rows in order: each vertex row, then its band if any.
+        band_at = {start - 1: intervals for start, _, intervals in bands}
+        row_intervals = []
+        for y in ys:
+            row_intervals.append(vertex_row_intervals[y])
+            if y in band_at:
+                row_intervals.append(band_at[y])
 
-    bands = []
-    for a, b in zip(ys, ys[1:]):
-        if b - a <= 1:
-            continue
-        sample_y = a + 1
-        intervals = compute_intervals_for_row(sample_y, False)
-        bands.append((a + 1, b - 1, intervals))
+        # Cover counts per compressed cell from every row's intervals at
+        # once; interval ends are vertex xs, so they cover whole segments.
+        starts, ends, rows = [], [], []
+        for r, intervals in enumerate(row_intervals):
+            for l, r_end in intervals:
+                starts.append(self.col_of[l])
+                ends.append(self.col_of[r_end] + 1)
+                rows.append(r)
+        cover = np.zeros((len(row_intervals), cols + 1), dtype=np.int32)
+        np.add.at(cover, (rows, starts), 1)
+        np.add.at(cover, (rows, ends), -1)
+        depth = np.cumsum(cover, axis=1)[:, :cols]
+        del cover
+
+        # outside[r + 1, c + 1] prefix sums over compressed cells.
+        self.outside = np.zeros((len(row_intervals) + 1, cols + 1), dtype=np.int64)
+        np.cumsum(depth <= 0, axis=0, out=self.outside[1:, 1:])
+        np.cumsum(self.outside[1:, 1:], axis=1, out=self.outside[1:, 1:])
+
+    def contains(self, xmin: int, ymin: int, xmax: int, ymax: int) -> bool:
+        # Corners must be vertex coordinates.
+        c1, c2 = self.col_of[xmin], self.col_of[xmax] + 1
+        r1, r2 = self.row_of[ymin], self.row_of[ymax] + 1
+        item = self.outside.item
+        return not (item(r2, c2) - item(r1, c2) - item(r2, c1) + item(r1, c1))
 
+
+def solve_part_2(puzzle_input):
     # Evaluate all rectangles defined by pairs of red points
+    points = puzzle_input
+    n = len(points)
+    oracle = InsideOracle(points)
+
     max_area = 0
     for i in range(n):
         x1, y1 = points[i]
@@ -96,34 +179,162 @@ def solve_part_2(puzzle_input):
             x2, y2 = points[j]
             xmin, xmax = (x1, x2) if x1 <= x2 else (x2, x1)
             ymin, ymax = (y1, y2) if y1 <= y2 else (y2, y1)
-
-            valid = True
-
-            # Check vertex rows within the rectangle
-            for y in ys:
-                if ymin <= y <= ymax:
-                    if not intervals_cover(vertex_row_intervals[y], xmin, xmax):
-                        valid = False
-                        break
-            if not valid:
-                continue
-
-            # Check bands (rows strictly between vertex rows)
-            for start, end, intervals in bands:
-                if end < ymin or start > ymax:
-                    continue
-                if not intervals_cover(intervals, xmin, xmax):
-                    valid = False
-                    break
-
-            if valid:
-                area = (xmax - xmin + 1) * (ymax - ymin + 1)
-                if area > max_area:
-                    max_area = area
+            area = (xmax - xmin + 1) * (ymax - ymin + 1)
+            if area > max_area and oracle.contains(xmin, ymin, xmax, ymax):
+                max_area = area
 
     return max_area
 
 
+def row_bounds(points: List[Point], coords: np.ndarray) -> np.ndarray:
+    # Upper bound on the largest rectangle each point can span: any partner
+    # is dominated by a staircase point in its quadrant, which only grows
+    # the area.
+    directions = ((-1, -1), (1, 1), (-1, 1), (1, -1))
+    stairs = np.array(
+        [p for dirs in directions for p in staircase(points, *dirs)], dtype=np.int64
+    )
+    bounds = np.empty(len(coords), dtype=np.int64)
+    for i, (x, y) in enumerate(coords.tolist()):
+        areas = (np.abs(stairs[:, 0] - x) + 1) * (np.abs(stairs[:, 1] - y) + 1)
+        bounds[i] = areas.max()
+    return bounds
+
+
+class RectangleSearch:
+    # Everything the block search needs as flat arrays, so it can be rebuilt
+    # in a worker around a prefix table that lives in shared memory.
+    def __init__(self, coords, cells, bounds, outside):
+        self.coords = coords  # (n, 2) vertex coordinates
+        self.cells = cells  # (n, 2) compressed column and row of each vertex
+        self.bounds = bounds
+        self.outside = outside
+
+    @classmethod
+    def from_points(cls, points: List[Point]):
+        oracle = InsideOracle(points)
+        coords = np.array(points, dtype=np.int64).reshape(-1, 2)
+        cells = np.array(
+            [(oracle.col_of[x], oracle.row_of[y]) for x, y in points], dtype=np.int64
+        ).reshape(-1, 2)
+        return cls(coords, cells, row_bounds(points, coords), oracle.outside)
+
+    def blocks(self, block: Optional[int] = None) -> List[np.ndarray]:
+        # Vertices in descending bound order, cut into blocks of rows small
+        # enough that a block's area matrix stays around 8 MiB.
+        n = len(self.coords)
+        block = block or max(1, (1 << 20) // max(n, 1))
+        order = np.argsort(-self.bounds, kind="stable")
+        return [order[k : k + block] for k in range(0, n, block)]
+
+    def best_in_block(self, rows: np.ndarray, best: int) -> int:
+        # Largest inside rectangle with one corner in rows, or best if none
+        # beats it. Only pairs whose area beats best reach the prefix table.
+        x, y = self.coords[:, 0], self.coords[:, 1]
+        areas = (np.abs(x[rows, None] - x) + 1) * (np.abs(y[rows, None] - y) + 1)
+        r, j = np.nonzero(areas > best)
+        if not len(r):
+            return best
+        areas = areas[r, j]
+        i = rows[r]
+
+        col, row = self.cells[:, 0], self.cells[:, 1]
+        c1, c2 = np.minimum(col[i], col[j]), np.maximum(col[i], col[j]) + 1
+        r1, r2 = np.minimum(row[i], row[j]), np.maximum(row[i], row[j]) + 1
+        outside = self.outside
+        bad = outside[r2, c2] - outside[r1, c2] - outside[r2, c1] + outside[r1, c1]
+        inside = areas[bad == 0]
+        return max(best, int(inside.max())) if len(inside) else best
+
+    def search(self, blocks, best: int = 0) -> int:
+        # Blocks come in descending bound order, so once a block's first
+        # bound cannot beat best no later rectangle can either.
+        for rows in blocks:
+            if self.bounds[rows[0]] <= best:
+                break
+            best = self.best_in_block(rows, best)
+        return best
+
+
+def solve_part_2_descending(puzzle_input, block: Optional[int] = None):
+    # Same answer as solve_part_2: rows with the largest possible rectangles
+    # are checked first, a whole block at a time, and the search stops as
+    # soon as the best inside rectangle beats every remaining bound.
+    if len(puzzle_input) < 2:
+        return 0
+    search = RectangleSearch.from_points(puzzle_input)
+    return search.search(search.blocks(block))
+
+
+# Set in each worker by attach_shared: the search over the shared prefix
+# table, and the best area found so far by any worker.
+worker_state = {}
+
+
+def attach_shared(table_name, shape, best_name, coords, cells, bounds):
+    table = shared_memory.SharedMemory(name=table_name)
+    best = shared_memory.SharedMemory(name=best_name)
+    worker_state["shm"] = (table, best)
+    outside = np.ndarray(shape, dtype=np.int64, buffer=table.buf)
+    worker_state["search"] = RectangleSearch(coords, cells, bounds, outside)
+    worker_state["best"] = np.ndarray(1, dtype=np.int64, buffer=best.buf)
+
+
+def search_shared(blocks) -> int:
+    # Prune against the best area any worker has published, and publish our
+    # own improvements. The update is not atomic, so a racing worker may
+    # briefly lower it; that only weakens pruning, since every worker still
+    # returns its own best.
+    search, shared = worker_state["search"], worker_state["best"]
+    best = 0
+    for rows in blocks:
+        best = max(best, int(shared[0]))
+        if search.bounds[rows[0]] <= best:
+            break
+        best = search.best_in_block(rows, best)
+        if best > shared[0]:
+            shared[0] = best
+    return best
+
+
+def solve_part_2_parallel(puzzle_input, workers=None, block: Optional[int] = None):
+    # The descending block search split across a pool: worker k takes blocks
+    # k, k + workers, ..., so every worker starts on the largest rectangles.
+    # The prefix table and the running best live in shared memory, and each
+    # worker stops once no block it has left can beat the shared best.
+    if len(puzzle_input) < 2:
+        return 0
+    workers = workers or os.cpu_count() or 1
+    search = RectangleSearch.from_points(puzzle_input)
+    outside = search.outside
+    blocks = search.blocks(block)
+
+    table = shared_memory.SharedMemory(create=True, size=max(outside.nbytes, 1))
+    best = shared_memory.SharedMemory(create=True, size=8)
+    try:
+        np.ndarray(outside.shape, dtype=np.int64, buffer=table.buf)[:] = outside
+        np.ndarray(1, dtype=np.int64, buffer=best.buf)[0] = 0
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=attach_shared,
+            initargs=(
+                table.name,
+                outside.shape,
+                best.name,
+                search.coords,
+                search.cells,
+                search.bounds,
+            ),
+        ) as pool:
+            shares = [blocks[k::workers] for k in range(workers)]
+            return max(pool.map(search_shared, shares))
+    finally:
+        table.close()
+        table.unlink()
+        best.close()
+        best.unlink()
+
+
 def get_puzzle_input():
     lines = []
     with open("input.txt") as f: